@@ -1,83 +1,193 @@
+import io
 import os
-import tempfile
-import subprocess
-from pathlib import Path
-from typing import Tuple
+import wave
+import asyncio
+import hashlib
+from typing import Optional, Tuple
+import av
+import numpy as np
+import webrtcvad
 from loguru import logger
-from fastapi import UploadFile
 
+# Sample rate expected by Whisper models
+SAMPLE_RATE = 16000
 
-async def preprocess_audio(file: UploadFile, original_filename: str) -> Tuple[Path, float]:
+# Clips quieter than this (RMS and peak, in full scale) are treated as silence
+SILENCE_RMS = 1e-3
+SILENCE_PEAK = 0.01
+
+# WebRTC VAD works on 10/20/30 ms frames of 16-bit PCM
+VAD_FRAME_SAMPLES = SAMPLE_RATE * 30 // 1000
+VAD_AGGRESSIVENESS = 2
+# Silence shorter than this between voiced frames is kept as part of the speech
+VAD_MIN_SILENCE_MS = 500
+
+
+async def preprocess_audio(input_data: bytes, original_filename: str) -> Tuple[np.ndarray, int]:
     """
     Simple and reliable audio preprocessing for transcription.
     
     Args:
-        file: Audio file upload
+        input_data: Contents of the uploaded audio file
         original_filename: Original filename with extension
         
     Returns:
-        Path to processed audio file and processing time
+        16 kHz mono float32 samples in [-1, 1] and processing time in nanoseconds
     """
     import time
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
     
-    # Create a temp directory
-    temp_dir = tempfile.mkdtemp()
+    # Decode and resample in-process with libav, off the event loop
+    try:
+        audio = await asyncio.to_thread(_load_audio, input_data, original_filename)
+        if audio.size == 0:
+            raise RuntimeError("Decoding produced no audio samples")
+            
+        processing_time = time.perf_counter_ns() - start_time
+        return audio, processing_time
+        
+    except av.error.InvalidDataError as e:
+        error_msg = "Audio file appears to be corrupt or invalid format"
+        logger.error(f"{error_msg}: {e}")
+        raise RuntimeError(error_msg)
+    except Exception as e:
+        logger.error(f"Error preprocessing audio: {str(e)}")
+        raise RuntimeError(f"Audio preprocessing failed: {str(e)}")
+
+
+def _load_audio(data: bytes, original_filename: str) -> np.ndarray:
+    """
+    Convert an upload to 16 kHz mono float32 samples, reading WAV directly when possible.
     
-    # Save the uploaded file
-    temp_input_path = os.path.join(temp_dir, original_filename)
-    content = await file.read()
-    with open(temp_input_path, "wb") as f:
-        f.write(content)
+    Args:
+        data: Audio file contents
+        original_filename: Original filename with extension
+        
+    Returns:
+        16 kHz mono float32 samples in [-1, 1]
+    """
+    # WAV files already in Whisper's format need no decoding or resampling
+    if original_filename.lower().endswith(".wav"):
+        audio = _read_pcm16_wav(data)
+        if audio is not None:
+            return audio
+    return _decode_audio(data)
+
+
+def _decode_audio(data: bytes) -> np.ndarray:
+    """
+    Decode any supported container to 16 kHz mono float32 samples with PyAV.
     
-    # Create output path
-    output_filename = f"processed_{os.path.splitext(original_filename)[0]}.wav"
-    output_path = os.path.join(temp_dir, output_filename)
+    Args:
+        data: Audio file contents
+        
+    Returns:
+        float32 samples in [-1, 1]
+    """
+    resampler = av.AudioResampler(format="flt", layout="mono", rate=SAMPLE_RATE)
+    chunks = []
+    # A seekable in-memory file lets libav read MP4 indexes stored at the end
+    with av.open(io.BytesIO(data), mode="r", metadata_errors="ignore") as container:
+        for frame in container.decode(audio=0):
+            for resampled in resampler.resample(frame):
+                chunks.append(resampled.to_ndarray().reshape(-1))
+        # Flush samples still buffered in the resampler
+        for resampled in resampler.resample(None):
+            chunks.append(resampled.to_ndarray().reshape(-1))
     
-    # Convert using FFmpeg
-    cmd = [
-        "ffmpeg",
-        "-y",  # Overwrite output files
-        "-i", temp_input_path,  # Input file
-        "-ar", "16000",  # Sample rate
-        "-ac", "1",  # Mono
-        "-c:a", "pcm_s16le",  # Output codec
-        output_path  # Output file
-    ]
+    if not chunks:
+        return np.empty(0, dtype=np.float32)
+    return np.concatenate(chunks)
+
+
+def _read_pcm16_wav(data: bytes) -> Optional[np.ndarray]:
+    """
+    Decode a WAV file that is already 16 kHz mono 16-bit PCM.
     
-    # Run FFmpeg directly
+    Args:
+        data: WAV file contents
+        
+    Returns:
+        float32 samples in [-1, 1], or None if the file needs converting
+    """
     try:
-        result = subprocess.run(
-            cmd,
-            check=True,
-            capture_output=True,
-            text=True
-        )
+        with wave.open(io.BytesIO(data)) as wav:
+            if (wav.getframerate(), wav.getnchannels(), wav.getsampwidth()) != (SAMPLE_RATE, 1, 2):
+                return None
+            frames = wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError):
+        return None
+    
+    if not frames:
+        return None
+    return np.frombuffer(frames, dtype="<i2").astype(np.float32) / 32768.0
+
+
+def hash_upload(data: bytes) -> str:
+    """
+    Hash the contents of an upload.
+    
+    Args:
+        data: Audio file contents
         
-        # Check if output exists
-        if not os.path.exists(output_path):
-            raise RuntimeError("FFmpeg failed to create output file")
-            
-        processing_time = time.time() - start_time
-        return Path(output_path), processing_time
+    Returns:
+        Hex digest of the file contents
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def is_silent(audio: np.ndarray) -> bool:
+    """
+    Cheap energy gate for near-silent clips, checked before any model runs.
+    
+    Args:
+        audio: 16 kHz mono float32 samples
         
-    except subprocess.CalledProcessError as e:
-        error_msg = f"FFmpeg error: {e.stderr}"
-        if "Invalid data found when processing input" in e.stderr:
-            error_msg = "Audio file appears to be corrupt or invalid format"
+    Returns:
+        True if both the RMS level and the peak are below the silence thresholds
+    """
+    if not audio.size:
+        return True
+    rms = np.sqrt(np.dot(audio, audio) / audio.size)
+    return rms < SILENCE_RMS and np.abs(audio).max() < SILENCE_PEAK
+
+
+def trim_silence(audio: np.ndarray) -> np.ndarray:
+    """
+    Drop leading and trailing silence using WebRTC VAD.
+    
+    Args:
+        audio: 16 kHz mono float32 samples
         
-        logger.error(error_msg)
-        raise RuntimeError(error_msg)
-    except Exception as e:
-        logger.error(f"Error preprocessing audio: {str(e)}")
-        raise RuntimeError(f"Audio preprocessing failed: {str(e)}")
+    Returns:
+        The span from the first to the last voiced frame, padded by the minimum
+        silence duration; an empty array if no speech was found
+    """
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+    frame_bytes = VAD_FRAME_SAMPLES * 2
+    vad = webrtcvad.Vad(VAD_AGGRESSIVENESS)
+    
+    voiced = [
+        index
+        for index, offset in enumerate(range(0, len(pcm) - frame_bytes + 1, frame_bytes))
+        if vad.is_speech(pcm[offset:offset + frame_bytes], SAMPLE_RATE)
+    ]
+    if not voiced:
+        return audio[:0]
+    
+    padding = SAMPLE_RATE * VAD_MIN_SILENCE_MS // 1000
+    start = max(0, voiced[0] * VAD_FRAME_SAMPLES - padding)
+    end = min(len(audio), (voiced[-1] + 1) * VAD_FRAME_SAMPLES + padding)
+    return audio[start:end]
+
+
+# Upload extensions accepted for transcription; a tuple so str.endswith can check them all at once
+ALLOWED_EXTENSIONS = (".mp3", ".wav", ".m4a", ".flac", ".ogg", ".aac", ".webm")
 
 
 def is_valid_audio_format(filename: str) -> bool:
     """Check if file has valid audio extension."""
-    valid_extensions = ['.mp3', '.wav', '.m4a', '.flac', '.ogg', '.aac', '.webm']
-    _, ext = os.path.splitext(filename.lower())
-    return ext in valid_extensions
+    return filename.lower().endswith(ALLOWED_EXTENSIONS)
 
 
 def get_file_size_mb(file_path: str) -> float:
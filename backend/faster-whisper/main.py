@@ -1,21 +1,29 @@
 import os
-from typing import Dict, Any
+import sys
+import asyncio
+from typing import Any, AsyncIterator, Dict, Optional
 from pathlib import Path
-from fastapi import FastAPI, UploadFile, File, HTTPException, Form
+from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from loguru import logger
+import orjson
 import uvicorn
 
-from transcription import TranscriptionService
+from transcription import TranscriptionService, DEFAULT_MODEL, device
 
-# Configure logging
-logger.add("logs/faster_whisper_api.log", rotation="10 MB")
+# Configure logging; DEBUG records are dropped before formatting unless enabled
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+logger.remove()
+logger.add(sys.stderr, level=LOG_LEVEL)
+logger.add("logs/faster_whisper_api.log", rotation="10 MB", level=LOG_LEVEL)
 
 # Create FastAPI app
 app = FastAPI(
     title="Faster Whisper API",
     description="API for transcribing audio using Faster Whisper",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -29,12 +37,48 @@ app.add_middleware(
 
 # Environment variables
 BASE_DIR = Path(__file__).parent.parent.parent
-MODEL_PATH = os.getenv("MODEL_PATH", str(BASE_DIR / "models" / "faster-whisper-base.en"))
+LOCAL_MODEL_PATH = BASE_DIR / "models" / "faster-whisper-base.en"
+# Prefer the bundled base.en model on CPU, otherwise use the device default
+if device == "cpu" and LOCAL_MODEL_PATH.exists():
+    DEFAULT_MODEL_PATH = str(LOCAL_MODEL_PATH)
+else:
+    DEFAULT_MODEL_PATH = DEFAULT_MODEL
+MODEL_PATH = os.getenv("MODEL_PATH", DEFAULT_MODEL_PATH)
 PORT = int(os.getenv("PORT", "3001"))
 HOST = os.getenv("HOST", "0.0.0.0")
+RELOAD = os.getenv("RELOAD", "false").lower() == "true"
 
-# Initialize transcription service
-transcription_service = TranscriptionService(model_path=MODEL_PATH)
+# Transcription service, loaded in a background thread once the server starts
+_service_task: Optional["asyncio.Task[TranscriptionService]"] = None
+
+def _create_transcription_service() -> TranscriptionService:
+    """Load and warm up the model"""
+    return TranscriptionService(model_path=MODEL_PATH)
+
+@app.on_event("startup")
+async def load_transcription_service():
+    """Start loading the model without holding up server startup"""
+    global _service_task
+    _service_task = asyncio.create_task(asyncio.to_thread(_create_transcription_service))
+
+async def get_transcription_service() -> TranscriptionService:
+    """Wait until the model has finished loading"""
+    # Shielded so a request cancelled while waiting does not cancel the load
+    return await asyncio.shield(_service_task)
+
+async def _ndjson_segments(segments: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Encode streamed segments as NDJSON, ending with an error record if decoding fails"""
+    # The 200 status has already been sent once streaming starts, so failures
+    # are reported in-band instead of through HTTPException
+    try:
+        async for segment in segments:
+            yield orjson.dumps(segment) + b"\n"
+    except TimeoutError as e:
+        logger.error(f"Transcription timeout: {str(e)}")
+        yield orjson.dumps({"error": str(e), "status": 504}) + b"\n"
+    except Exception as e:
+        logger.error(f"Transcription error: {str(e)}")
+        yield orjson.dumps({"error": str(e), "status": 500}) + b"\n"
 
 # Health check endpoint
 @app.get("/")
@@ -45,24 +89,55 @@ async def read_root():
 # Transcription endpoint
 @app.post("/transcribe")
 async def transcribe_audio(
+    request: Request,
     file: UploadFile = File(...),
     temperature: float = Form(0.0),
+    beam_size: Optional[int] = Form(None),
+    stream: bool = Form(False),
 ):
-    """Transcribe an audio file and return the transcription."""
+    """
+    Transcribe an audio file and return the transcription.
+    
+    With stream=true, segments are returned as newline-delimited JSON as soon as they are decoded.
+    """
     filename = file.filename
-    logger.info(f"Received transcription request for: {filename}")
+    logger.info("Received transcription request for: {}", filename)
     
     try:
         if not filename:
             raise ValueError("No filename provided")
         
-        result = await transcription_service.transcribe_file_upload(file, filename)
-        logger.info(f"Transcription completed in {result.get('total_ms', 0)}ms")
+        transcription_service = await get_transcription_service()
+        
+        if stream:
+            segments = await transcription_service.stream_file_upload(
+                file,
+                filename,
+                beam_size=beam_size,
+                temperature=temperature,
+                is_disconnected=request.is_disconnected
+            )
+            return StreamingResponse(
+                _ndjson_segments(segments),
+                media_type="application/x-ndjson"
+            )
+        
+        result = await transcription_service.transcribe_file_upload(
+            file,
+            filename,
+            beam_size=beam_size,
+            temperature=temperature,
+            is_disconnected=request.is_disconnected
+        )
+        logger.info("Transcription completed in {}ms", result.get("total_ms", 0))
         
         return result
     except ValueError as e:
         logger.error(f"Validation error: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
+    except TimeoutError as e:
+        logger.error(f"Transcription timeout: {str(e)}")
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         logger.error(f"Transcription error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -70,6 +145,7 @@ async def transcribe_audio(
 @app.get("/models")
 async def get_models():
     """Get a list of available models"""
+    transcription_service = await get_transcription_service()
     return transcription_service.get_available_models()
 
 if __name__ == "__main__":
@@ -77,4 +153,6 @@ if __name__ == "__main__":
     Path("logs").mkdir(exist_ok=True)
     
     logger.info(f"Starting server on {HOST}:{PORT}")
-    uvicorn.run("main:app", host=HOST, port=PORT, reload=True) 
\ No newline at end of file
+    # Auto-reload re-imports this module and reloads the model on every change,
+    # so it is only enabled on request for development
+    uvicorn.run("main:app" if RELOAD else app, host=HOST, port=PORT, reload=RELOAD) 
\ No newline at end of file
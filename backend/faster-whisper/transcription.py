@@ -1,184 +1,550 @@
 import os
+import psutil
+
+# CPUs this process may actually run on (respects affinity masks and cpusets)
+try:
+    AVAILABLE_CPUS = len(os.sched_getaffinity(0))
+except AttributeError:
+    AVAILABLE_CPUS = os.cpu_count() or 4
+
+# Containers limited with a CPU quota (docker --cpus, Kubernetes limits) still
+# see every host CPU above, so cap the count at the cgroup v2 quota
+try:
+    with open("/sys/fs/cgroup/cpu.max") as f:
+        quota, period = f.read().split()
+    if quota != "max":
+        AVAILABLE_CPUS = max(1, min(AVAILABLE_CPUS, -(-int(quota) // int(period))))
+except (OSError, ValueError):
+    pass
+
+# One compute thread per physical core: SMT siblings share the same FPUs and
+# caches, so running a thread on each of them only adds contention
+PHYSICAL_CPUS = min(AVAILABLE_CPUS, psutil.cpu_count(logical=False) or AVAILABLE_CPUS)
+
+# OpenMP, MKL and OpenBLAS size their pools when they are loaded, so set these
+# before importing numpy and torch
+os.environ.setdefault("OMP_NUM_THREADS", str(PHYSICAL_CPUS))
+os.environ.setdefault("MKL_NUM_THREADS", str(PHYSICAL_CPUS))
+os.environ.setdefault("OPENBLAS_NUM_THREADS", str(PHYSICAL_CPUS))
+
 import asyncio
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Union, Tuple
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, Iterable, Optional, Tuple
 from loguru import logger
+import numpy as np
 import torch
-from faster_whisper import WhisperModel
+import ctranslate2
+from faster_whisper import WhisperModel, BatchedInferencePipeline
+from faster_whisper.transcribe import Segment
 from fastapi import UploadFile
 
-from audio_utils import preprocess_audio, is_valid_audio_format
+from audio_utils import preprocess_audio, is_valid_audio_format, hash_upload, is_silent, trim_silence, SAMPLE_RATE
 
 # Check for GPU availability
 device = "cuda" if torch.cuda.is_available() else "cpu"
-compute_type = "float16" if device == "cuda" else "int8"
-logger.info(f"Using device: {device} with compute type: {compute_type}")
+logger.info(f"Using device: {device}")
+
+# Default models per device: distilled large-v3 on GPU, base.en on CPU
+DEFAULT_GPU_MODEL = "Systran/faster-distil-whisper-large-v3"
+DEFAULT_CPU_MODEL = "Systran/faster-whisper-base.en"
+DEFAULT_MODEL = DEFAULT_GPU_MODEL if device == "cuda" else DEFAULT_CPU_MODEL
+
+# CTranslate2 model replicas that can serve concurrent requests (weights are shared).
+# One by default: requests queue and each decode gets every core, which beats
+# splitting the cores between concurrent decodes for single-user dictation
+CT2_NUM_WORKERS = int(os.getenv("CT2_NUM_WORKERS", "1"))
+
+# Every visible GPU gets its own model replica with CT2_NUM_WORKERS workers
+# (CUDA_VISIBLE_DEVICES limits which ones are visible)
+DEVICE_INDEX = list(range(torch.cuda.device_count())) if device == "cuda" else [0]
+
+# CPU optimization settings: split the physical cores between the workers
+CPU_THREADS = max(1, PHYSICAL_CPUS // CT2_NUM_WORKERS)
+logger.info(f"Using {CPU_THREADS} CPU threads per worker for processing")
+
+# Dedicated inference pool sized to the CTranslate2 workers on all devices; it
+# serializes decodes beyond that count, so the hardware is never oversubscribed
+_INFER_POOL = ThreadPoolExecutor(max_workers=CT2_NUM_WORKERS * len(DEVICE_INDEX), thread_name_prefix="ct2")
+
+# Greedy decoding on CPU, where each extra beam is a full decoder pass
+DEFAULT_BEAM_SIZE = int(os.getenv("BEAM_SIZE", "1" if device == "cpu" else "5"))
+
+# Default beam width by audio length: (shorter than N seconds, beam width),
+# capped at DEFAULT_BEAM_SIZE. Dictation clips gain almost nothing from beams
+BEAM_SIZE_BY_DURATION = ((20.0, 1), (60.0, 2))
+
+# Fused attention kernels on GPU; needs an Ampere or newer card, so loading
+# falls back to standard attention if CTranslate2 rejects it
+FLASH_ATTENTION = os.getenv("FLASH_ATTENTION", "true" if device == "cuda" else "false").lower() == "true"
+
+# Number of VAD chunks decoded together by the batched pipeline
+BATCH_SIZE = int(os.getenv("BATCH_SIZE", "8"))
+
+# Clips shorter than this fit in a single Whisper window and skip VAD and batching
+SHORT_AUDIO_S = 30.0
+
+# Upper bound on a single transcription in seconds, 0 disables the limit
+INFERENCE_TIMEOUT_S = float(os.getenv("INFERENCE_TIMEOUT_S", "0"))
+
+# How long to wait for the next segment before checking the timeout and client connection
+SEGMENT_POLL_INTERVAL_S = 1.0
+
+# Marks the end of the segment stream produced by the inference thread
+_END_OF_SEGMENTS = object()
+
+# Process-wide LRU model cache keyed by (model_path, device, compute_type).
+# Each entry stores the loaded model, its batched pipeline and the mtime of its
+# model.bin so that services reuse the weights unless they changed on disk. Evicted models are
+# freed once no service holds them any more.
+MODEL_CACHE_SIZE = int(os.getenv("MODEL_CACHE_SIZE", "4"))
+_MODEL_CACHE: "OrderedDict[Tuple[str, str, str], Tuple[WhisperModel, BatchedInferencePipeline, float]]" = OrderedDict()
+
+# Model sizes faster-whisper can download by name
+BUILT_IN_MODELS = (
+    "tiny", "tiny.en",
+    "base", "base.en",
+    "small", "small.en",
+    "medium", "medium.en",
+    "large-v1", "large-v2", "large-v3",
+    "large-v3-turbo", "distil-large-v3",
+)
+
+# Bounded LRU cache of greedy (temperature 0) responses keyed by (content hash,
+# model, compute type, service beam size, requested beam size)
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "128"))
+_RESULT_CACHE: "OrderedDict[Tuple[str, str, str, int, Optional[int]], Dict[str, Any]]" = OrderedDict()
+
+
+def _model_mtime(model_path: str) -> float:
+    """Return the mtime of model.bin for a local model, or 0 for a model size."""
+    model_bin = Path(model_path) / "model.bin"
+    return model_bin.stat().st_mtime if model_bin.exists() else 0.0
+
+
+def _default_beam_size(duration_s: float, max_beam_size: int = DEFAULT_BEAM_SIZE) -> int:
+    """Return the beam width for audio of the given length when the request sets none."""
+    for max_duration_s, beam_size in BEAM_SIZE_BY_DURATION:
+        if duration_s < max_duration_s:
+            return min(beam_size, max_beam_size)
+    return max_beam_size
+
+
+def _pick_compute_type(model_path: str, device: str) -> str:
+    """
+    Choose the CTranslate2 compute type for a model, unless COMPUTE_TYPE overrides it.
+    
+    Small models prefer plain INT8 everywhere. Medium and large models keep FP16
+    activations on GPU (int8_float16). On CPU, int8_float32 lets CTranslate2 use
+    VNNI int8 kernels where the CPU has them. Each preference list falls back to
+    the first type the device actually supports.
+    
+    Args:
+        model_path: Local model directory or model name
+        device: "cuda" or "cpu"
+        
+    Returns:
+        Compute type string accepted by WhisperModel
+    """
+    override = os.getenv("COMPUTE_TYPE")
+    if override:
+        return override
+    
+    model_name = os.path.basename(model_path.rstrip("/\\")).lower()
+    if device == "cpu":
+        preferred = ("int8_float32", "int8", "float32")
+    elif any(size in model_name for size in ("medium", "large", "turbo")):
+        preferred = ("int8_float16", "float16", "int8", "float32")
+    else:
+        preferred = ("int8", "int8_float16", "float16", "float32")
+    
+    supported = ctranslate2.get_supported_compute_types(device)
+    return next((compute_type for compute_type in preferred if compute_type in supported), "default")
 
-# CPU optimization settings
-CPU_THREADS = min(os.cpu_count() or 4, 4)
-logger.info(f"Using {CPU_THREADS} CPU threads for processing")
 
 class TranscriptionService:
-    def __init__(self, model_path: str = "models/faster-whisper-base.en"):
+    def __init__(
+        self,
+        model_path: str = "models/faster-whisper-base.en",
+        compute_type: Optional[str] = None,
+        beam_size: int = DEFAULT_BEAM_SIZE
+    ):
         """
         Initialize the transcription service with the Faster Whisper model.
         
         Args:
             model_path: Path to the Faster Whisper model
+            compute_type: CTranslate2 compute type (picked for the model and device if not given)
+            beam_size: Largest beam width used when a request does not set one
         """
         self.model_path = model_path
+        self.compute_type = compute_type or _pick_compute_type(model_path, device)
+        self.beam_size = beam_size
         self.model_load_time = 0
         self._load_model()
+        # Nothing here changes for the lifetime of the service, so build it once
+        self._model_info = {
+            "current_model": self.model_path,
+            "default_model": DEFAULT_MODEL,
+            "available_models": BUILT_IN_MODELS,
+            "device": device,
+            "compute_type": self.compute_type
+        }
         logger.info(f"TranscriptionService initialized with model: {model_path}")
         
     def _load_model(self) -> None:
-        """Load the Faster Whisper model with CPU optimizations"""
-        logger.info(f"Loading Faster Whisper model from {self.model_path}")
-        start_time = time.time()
+        """Load the Faster Whisper model with CPU optimizations, reusing a cached instance"""
+        cache_key = (self.model_path, device, self.compute_type)
+        mtime = _model_mtime(self.model_path)
+        
+        cached = _MODEL_CACHE.get(cache_key)
+        if cached is not None and cached[2] == mtime:
+            logger.info(f"Reusing cached Faster Whisper model for {self.model_path}")
+            _MODEL_CACHE.move_to_end(cache_key)
+            self.model, self.batched_model, _ = cached
+            return
+        
+        logger.info(f"Loading Faster Whisper model from {self.model_path} with compute type: {self.compute_type}")
+        start_time = time.perf_counter()
         
         try:
             # Optimize for CPU performance with CTranslate2 settings
             cpu_options = {
                 "cpu_threads": CPU_THREADS,
-                "num_workers": 1,  # For predictable latency
+                "num_workers": CT2_NUM_WORKERS,  # Concurrent requests run in parallel
+                "device_index": DEVICE_INDEX,
             }
             
             # Check if we're using a local path or a model size
             if Path(self.model_path).exists():
                 logger.info(f"Loading model from local directory: {self.model_path}")
-                # Load the model from a local directory
+            else:
+                # Use model size (e.g., "base", "small", "medium", "large-v3")
+                logger.info(f"Using model size: {self.model_path}")
+            
+            try:
                 self.model = WhisperModel(
                     self.model_path,
                     device=device,
-                    compute_type=compute_type,
+                    compute_type=self.compute_type,
+                    flash_attention=FLASH_ATTENTION,
                     **cpu_options
                 )
-            else:
-                # Use model size (e.g., "base", "small", "medium", "large-v3")
-                logger.info(f"Using model size: {self.model_path}")
+            except (ValueError, RuntimeError) as e:
+                if not FLASH_ATTENTION:
+                    raise
+                logger.warning(f"Flash attention unavailable ({e}), using standard attention")
                 self.model = WhisperModel(
                     self.model_path,
                     device=device,
-                    compute_type=compute_type,
+                    compute_type=self.compute_type,
                     **cpu_options
                 )
+            self.batched_model = BatchedInferencePipeline(model=self.model)
+            # Warm up before caching so reused models are always warm and the
+            # one-time init cost lands in the load time, not the first request
+            self._warmup()
+            _MODEL_CACHE[cache_key] = (self.model, self.batched_model, mtime)
+            _MODEL_CACHE.move_to_end(cache_key)
+            if len(_MODEL_CACHE) > MODEL_CACHE_SIZE:
+                _MODEL_CACHE.popitem(last=False)
             
-            self.model_load_time = time.time() - start_time
+            self.model_load_time = time.perf_counter() - start_time
             logger.info(f"Model loaded successfully in {self.model_load_time:.2f} seconds")
         except Exception as e:
             logger.error(f"Error loading model: {e}")
             raise RuntimeError(f"Failed to load Faster Whisper model: {e}")
     
-    async def transcribe_file_upload(self, file: UploadFile, filename: str) -> Dict[str, Any]:
+    async def transcribe_file_upload(
+        self,
+        file: UploadFile,
+        filename: str,
+        beam_size: Optional[int] = None,
+        temperature: float = 0.0,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None
+    ) -> Dict[str, Any]:
         """
         Transcribe audio from an uploaded file with detailed performance metrics.
         
         Args:
             file: Audio file from FastAPI UploadFile
             filename: Original filename with extension
+            beam_size: Beam width for decoding (defaults by audio length, up to the service's beam_size)
+            temperature: Sampling temperature
+            is_disconnected: Coroutine function reporting whether the client went away
             
         Returns:
             Transcription result with performance metrics
         """
-        metrics = {
-            "model_load": self.model_load_time,
-            "validation": 0,
-            "audio_preprocessing": 0,
-            "model_inference": 0,
-            "total": 0
-        }
-        
-        total_start = time.time()
+        total_start = time.perf_counter_ns()
         
         # Validate file format
-        validation_start = time.time()
         if not is_valid_audio_format(filename):
             logger.error(f"Invalid audio format: {filename}")
             raise ValueError(f"Invalid audio format. Supported formats: mp3, wav, flac, m4a, ogg, aac, webm")
-        metrics["validation"] = time.time() - validation_start
         
         try:
-            # Preprocess audio
-            preprocessing_start = time.time()
-            logger.debug(f"Starting audio preprocessing for {filename}")
-            processed_path, processing_time = await preprocess_audio(file, filename)
-            metrics["audio_preprocessing"] = processing_time
+            input_data = await file.read()
             
-            # Execute transcription in a separate thread to not block the event loop
-            logger.debug(f"Starting Faster Whisper inference")
+            # Serve repeated uploads of the same audio from the cache; an unset
+            # beam width is keyed as None since it only depends on the audio.
+            # Sampled output (temperature > 0) is not deterministic, so it is never cached
+            cache_key = None
+            if RESULT_CACHE_SIZE > 0 and temperature == 0:
+                cache_key = (
+                    await asyncio.to_thread(hash_upload, input_data),
+                    self.model_path,
+                    self.compute_type,
+                    self.beam_size,
+                    beam_size
+                )
+                cached = _RESULT_CACHE.get(cache_key)
+                if cached is not None:
+                    _RESULT_CACHE.move_to_end(cache_key)
+                    logger.debug("Returning cached transcription for {}", filename)
+                    # No preprocessing or inference ran for this request
+                    return {
+                        **cached,
+                        "total_ms": (time.perf_counter_ns() - total_start) // 1_000_000,
+                        "preprocessing_ms": 0,
+                        "model_inference_ms": 0,
+                        "first_segment_ms": 0,
+                        "cached": True
+                    }
             
-            # Run in a separate thread to avoid blocking the event loop
-            loop = asyncio.get_event_loop()
-            transcription, inference_time = await loop.run_in_executor(
-                None,
-                lambda: self._transcribe_audio_file(str(processed_path))
-            )
+            # Preprocess audio
+            logger.debug("Starting audio preprocessing for {}", filename)
+            audio, processing_time = await preprocess_audio(input_data, filename)
+            beam_size = beam_size or _default_beam_size(len(audio) / SAMPLE_RATE, self.beam_size)
             
-            metrics["model_inference"] = inference_time
+            # Decode on the inference pool, consuming segments as they are produced
+            logger.debug("Starting Faster Whisper inference")
+            inference_start = time.perf_counter_ns()
+            first_segment_ns = 0
+            texts = []
+            async for segment in self._stream_segments(audio, beam_size, temperature, is_disconnected):
+                if not texts:
+                    first_segment_ns = time.perf_counter_ns() - inference_start
+                texts.append(segment.text.strip())
+            transcription = " ".join(texts)
             
-            # Calculate total time
-            metrics["total"] = time.time() - total_start
+            inference_end = time.perf_counter_ns()
             
             # Create a simplified response
             response = {
                 "text": transcription,
                 "language": "en",
-                "total_ms": round(metrics["total"] * 1000),
-                "preprocessing_ms": round(metrics["audio_preprocessing"] * 1000),
-                "model_inference_ms": round(metrics["model_inference"] * 1000),
+                "total_ms": (inference_end - total_start) // 1_000_000,
+                "preprocessing_ms": processing_time // 1_000_000,
+                "model_inference_ms": (inference_end - inference_start) // 1_000_000,
+                "first_segment_ms": first_segment_ns // 1_000_000,
             }
             
+            if cache_key is not None:
+                _RESULT_CACHE[cache_key] = response
+                if len(_RESULT_CACHE) > RESULT_CACHE_SIZE:
+                    _RESULT_CACHE.popitem(last=False)
+            
             return response
         except Exception as e:
             logger.error(f"Error in transcription: {e}")
             raise
     
-    def _transcribe_audio_file(self, audio_path: str) -> Tuple[str, float]:
+    async def stream_file_upload(
+        self,
+        file: UploadFile,
+        filename: str,
+        beam_size: Optional[int] = None,
+        temperature: float = 0.0,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        Transcribe an audio file using the Faster Whisper model.
+        Validate and preprocess an upload, then stream its segments as they are decoded.
+        
+        Validation and preprocessing errors are raised here, before any segment is produced.
         
         Args:
-            audio_path: Path to the audio file
+            file: Audio file from FastAPI UploadFile
+            filename: Original filename with extension
+            beam_size: Beam width for decoding (defaults by audio length, up to the service's beam_size)
+            temperature: Sampling temperature
+            is_disconnected: Coroutine function reporting whether the client went away
             
         Returns:
-            Transcription text and inference time
+            Async iterator of segment dicts with text, start and end times
         """
-        inference_start = time.time()
+        if not is_valid_audio_format(filename):
+            logger.error(f"Invalid audio format: {filename}")
+            raise ValueError(f"Invalid audio format. Supported formats: mp3, wav, flac, m4a, ogg, aac, webm")
         
-        try:
-            # Run inference
-            segments, info = self.model.transcribe(
-                audio_path,
-                language="en",
-                beam_size=5,
-                temperature=0.0,
-                vad_filter=True,
-                vad_parameters=dict(min_silence_duration_ms=500)
-            )
-            
-            # Collect all segments
-            result = " ".join(segment.text for segment in segments)
-            inference_time = time.time() - inference_start
+        logger.debug("Starting audio preprocessing for {}", filename)
+        audio, _ = await preprocess_audio(await file.read(), filename)
+        
+        beam_size = beam_size or _default_beam_size(len(audio) / SAMPLE_RATE, self.beam_size)
+        segments = self._stream_segments(audio, beam_size, temperature, is_disconnected)
+        return (
+            {"text": segment.text.strip(), "start": segment.start, "end": segment.end}
+            async for segment in segments
+        )
+    
+    def _decode_segments(
+        self,
+        audio: np.ndarray,
+        beam_size: int = DEFAULT_BEAM_SIZE,
+        temperature: float = 0.0
+    ) -> Iterable[Segment]:
+        """
+        Start decoding audio with the Faster Whisper model.
+        
+        Args:
+            audio: 16 kHz mono float32 samples
+            beam_size: Beam width for decoding
+            temperature: Sampling temperature
             
-            return result.strip(), inference_time
+        Returns:
+            Lazy generator of segments; each one is decoded when it is consumed
+        """
+        # Language and task are fixed, so no language-detection pass is run
+        decode_options = dict(
+            language="en",
+            task="transcribe",
+            beam_size=beam_size,
+            best_of=1,
+            # A single temperature means no fallback re-decoding; the thresholds
+            # below only decide which segments are dropped as silence
+            temperature=temperature,
+            compression_ratio_threshold=2.4,
+            log_prob_threshold=-1.0,
+            no_speech_threshold=0.6,
+            # Each chunk is decoded independently: no prompt carried over and
+            # no timestamp tokens, since segment times come from the chunks
+            condition_on_previous_text=False,
+            initial_prompt=None,
+            without_timestamps=True,
+            word_timestamps=False,
+        )
+        
+        # Near-silent uploads (accidental presses) never reach the model
+        if is_silent(audio):
+            return iter(())
+        
+        # Short clips are a single window: trim the silent ends with WebRTC VAD
+        # instead of running Silero, and skip batching entirely
+        if len(audio) / SAMPLE_RATE < SHORT_AUDIO_S:
+            audio = trim_silence(audio)
+            if not len(audio):
+                return iter(())
+            segments, info = self.model.transcribe(audio, vad_filter=False, **decode_options)
+            return segments
+        
+        # Run batched inference over VAD-segmented chunks
+        segments, info = self.batched_model.transcribe(
+            audio,
+            batch_size=BATCH_SIZE,
+            vad_filter=True,
+            vad_parameters=dict(min_silence_duration_ms=500, threshold=0.5),
+            **decode_options
+        )
+        return segments
+    
+    def _produce_segments(
+        self,
+        audio: np.ndarray,
+        beam_size: int,
+        temperature: float,
+        loop: asyncio.AbstractEventLoop,
+        queue: asyncio.Queue,
+        cancelled: threading.Event
+    ) -> None:
+        """Decode segments on an inference thread and hand each one to the event loop"""
+        try:
+            # The request may have been abandoned while it waited for a free worker
+            if cancelled.is_set():
+                return
+            for segment in self._decode_segments(audio, beam_size, temperature):
+                if cancelled.is_set():
+                    break
+                loop.call_soon_threadsafe(queue.put_nowait, segment)
         except Exception as e:
             logger.error(f"Error during transcription: {e}")
-            raise
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, _END_OF_SEGMENTS)
+    
+    async def _stream_segments(
+        self,
+        audio: np.ndarray,
+        beam_size: int,
+        temperature: float,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None
+    ) -> AsyncIterator[Segment]:
+        """
+        Yield segments as they are decoded, stopping early on timeout or disconnect.
+        
+        Args:
+            audio: 16 kHz mono float32 samples
+            beam_size: Beam width for decoding
+            temperature: Sampling temperature
+            is_disconnected: Coroutine function reporting whether the client went away
+            
+        Yields:
+            Decoded segments in order
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        cancelled = threading.Event()
+        deadline = loop.time() + INFERENCE_TIMEOUT_S if INFERENCE_TIMEOUT_S > 0 else None
+        
+        loop.run_in_executor(
+            _INFER_POOL,
+            self._produce_segments,
+            audio, beam_size, temperature, loop, queue, cancelled
+        )
+        
+        try:
+            while True:
+                # Checked on every segment, so a decode that keeps producing output is still cut off
+                timeout = SEGMENT_POLL_INTERVAL_S
+                if deadline is not None:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        raise TimeoutError(f"Transcription timed out after {INFERENCE_TIMEOUT_S:.0f} seconds")
+                    timeout = min(timeout, remaining)
+                
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    if is_disconnected is not None and await is_disconnected():
+                        raise RuntimeError("Client disconnected before transcription finished")
+                    continue
+                
+                if item is _END_OF_SEGMENTS:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Stop the inference thread at the next segment boundary
+            cancelled.set()
+    
+    def _warmup(self) -> None:
+        """Run a silent 1-second transcription so the first request skips one-time init costs"""
+        # Call the model directly: the silence trim would otherwise skip decoding altogether
+        warmup_start = time.perf_counter()
+        segments, info = self.model.transcribe(
+            np.zeros(SAMPLE_RATE, dtype=np.float32),
+            language="en",
+            beam_size=self.beam_size,
+            vad_filter=False,
+        )
+        for _ in segments:
+            pass
+        warmup_time = time.perf_counter() - warmup_start
+        logger.info(f"Model warmed up in {warmup_time:.2f} seconds")
     
     def get_available_models(self) -> Dict[str, Any]:
         """Get information about available models"""
-        built_in_models = [
-            "tiny", "tiny.en", 
-            "base", "base.en", 
-            "small", "small.en", 
-            "medium", "medium.en", 
-            "large-v1", "large-v2", "large-v3"
-        ]
-        
-        return {
-            "current_model": self.model_path,
-            "available_models": built_in_models,
-            "device": device,
-            "compute_type": compute_type
-        } 
\ No newline at end of file
+        return self._model_info
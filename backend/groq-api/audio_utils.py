@@ -1,66 +1,234 @@
 import os
+import glob
+import shutil
 import tempfile
 import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import BinaryIO, Tuple
+from typing import BinaryIO, Optional, Tuple
 from loguru import logger
 
+# Keep temporary audio files in RAM (tmpfs) when it is writable and has room;
+# Docker limits /dev/shm to 64 MB by default, so fall back to the system temp dir
+TMPFS_DIR = "/dev/shm"
+TMPFS_MIN_FREE_BYTES = 100 * 1024 * 1024
+TEMP_DIR = (
+    TMPFS_DIR
+    if os.path.isdir(TMPFS_DIR)
+    and os.access(TMPFS_DIR, os.W_OK)
+    and shutil.disk_usage(TMPFS_DIR).free > TMPFS_MIN_FREE_BYTES
+    else None
+)
 
-def preprocess_audio(file: BinaryIO, original_filename: str) -> Tuple[Path, float]:
+# On Linux, uploads that need a seekable input are written to an anonymous
+# in-memory file (memfd) instead of a temp dir; USE_MEMFD=false turns this off
+USE_MEMFD = (
+    hasattr(os, "memfd_create")
+    and os.path.isdir("/proc/self/fd")
+    and os.getenv("USE_MEMFD", "true").lower() == "true"
+)
+
+# Prefix for upload temp dirs, so stale ones can be told apart from other programs' files
+TEMP_DIR_PREFIX = "groq-audio-"
+# Temp dirs older than this are left over from a crash and swept at startup
+STALE_TEMP_DIR_AGE_S = 15 * 60
+
+# Temp dirs are removed by a background thread so the request does not wait on unlinks
+_cleanup_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cleanup")
+
+# Read uploads in 1 MiB chunks
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# "fLaC" marker, metadata block header and the 34-byte STREAMINFO block
+FLAC_HEADER_SIZE = 42
+
+# Codec sent to Groq: lossless FLAC, or Opus at speech bitrate for a far smaller
+# upload at the cost of more encoding CPU
+OUTPUT_CODECS = {
+    "flac": (["-c:a", "flac", "-f", "flac"], "audio.flac"),
+    "opus": (["-c:a", "libopus", "-b:a", "24k", "-application", "voip", "-f", "ogg"], "audio.ogg"),
+}
+PREPROCESS_CODEC = os.getenv("PREPROCESS_CODEC", "flac").lower()
+if PREPROCESS_CODEC not in OUTPUT_CODECS:
+    raise ValueError(f"Unsupported PREPROCESS_CODEC: {PREPROCESS_CODEC}. Supported codecs: flac, opus")
+OUTPUT_CODEC_ARGS, OUTPUT_FILENAME = OUTPUT_CODECS[PREPROCESS_CODEC]
+
+# Top-level MP4 boxes an M4A file may start with
+MP4_LEADING_BOXES = frozenset({b"ftyp", b"free", b"wide", b"skip", b"moov", b"mdat"})
+
+# Formats FFmpeg has to read from a file rather than a pipe
+SEEKABLE_INPUT_FORMATS = frozenset({"m4a"})
+
+
+def preprocess_audio(file: BinaryIO, original_filename: str) -> Tuple[bytes, int]:
     """
     Preprocess audio for optimal transcription.
     - Downsample to 16KHz
     - Convert to mono channel
-    - Convert to FLAC format for lossless compression
+    - Encode as FLAC (lossless) or Opus, depending on PREPROCESS_CODEC
     
     Args:
         file: Audio file binary data
         original_filename: Original filename with extension
     
     Returns:
-        Tuple with the path to the processed file and processing time in seconds
+        Tuple with the encoded audio data and processing time in nanoseconds
     """
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
     
-    # Create a temporary directory
-    temp_dir = tempfile.mkdtemp()
+    # Identify the container from its magic bytes rather than the client-supplied name;
+    # anything unrecognized falls back to the extension and FFmpeg's own probing
+    header = file.read(FLAC_HEADER_SIZE)
+    file.seek(0)
+    audio_format = sniff_format(header) or Path(original_filename).suffix.lower().lstrip(".")
     
-    # Get the original file extension
-    _, original_ext = os.path.splitext(original_filename)
+    # FLAC that is already 16KHz mono would come out of FFmpeg unchanged
+    if PREPROCESS_CODEC == "flac" and _is_16k_mono_flac(header):
+        logger.debug("Upload is already 16KHz mono FLAC, skipping FFmpeg")
+        return file.read(), time.perf_counter_ns() - start_time
     
-    # Save the uploaded file temporarily
-    temp_input_path = os.path.join(temp_dir, f"input{original_ext}")
-    with open(temp_input_path, "wb") as temp_file:
-        temp_file.write(file.read())
+    # Formats that keep their index at the end of the file need a seekable input,
+    # everything else is piped straight into FFmpeg without touching the disk
+    temp_dir = None
+    memfd = None
+    input_data = None
+    if audio_format not in SEEKABLE_INPUT_FORMATS:
+        input_source = "pipe:0"
+        input_data = file.read()
+    elif USE_MEMFD:
+        # FFmpeg opens the memfd through /proc, which gives it a seekable file with no inode on disk
+        memfd = os.memfd_create("audio", os.MFD_CLOEXEC)
+        with os.fdopen(memfd, "wb", closefd=False) as memfd_file:
+            shutil.copyfileobj(file, memfd_file, UPLOAD_CHUNK_SIZE)
+        input_source = f"/proc/self/fd/{memfd}"
+    else:
+        # Create a temporary directory for the upload; it is removed once FFmpeg is done
+        temp_dir = Path(tempfile.mkdtemp(prefix=TEMP_DIR_PREFIX, dir=TEMP_DIR))
+        input_source = temp_dir / f"input.{audio_format}"
+        # Copy the upload in chunks instead of holding it all in memory
+        with open(input_source, "wb") as temp_file:
+            shutil.copyfileobj(file, temp_file, UPLOAD_CHUNK_SIZE)
     
-    # Create the output filename
-    output_filename = f"processed_{os.path.basename(original_filename).split('.')[0]}.flac"
-    temp_output_path = os.path.join(temp_dir, output_filename)
-    
-    # Convert audio to 16KHz mono FLAC
+    # Convert audio to 16KHz mono in the output codec, written to stdout rather than a second file
     try:
         cmd = [
             "ffmpeg",
-            "-i", temp_input_path,
+            "-i", os.fspath(input_source),
             "-ar", "16000",  # Set sample rate to 16kHz
             "-ac", "1",      # Set to mono channel
             "-map", "0:a",   # Map only audio stream
-            "-c:a", "flac",  # Use FLAC codec
-            temp_output_path,
-            "-y",            # Overwrite if exists
-            "-loglevel", "error"  # Minimize logging
+            *OUTPUT_CODEC_ARGS,  # Output codec and container on stdout
+            "-loglevel", "error",  # Minimize logging
+            "pipe:1"
         ]
         
-        subprocess.run(cmd, check=True)
-        logger.info(f"Audio preprocessing complete: {output_filename}")
+        # run() feeds stdin while draining stdout, so large uploads cannot deadlock the pipes
+        result = subprocess.run(
+            cmd,
+            input=input_data,
+            check=True,
+            capture_output=True,
+            pass_fds=() if memfd is None else (memfd,)
+        )
+        logger.debug("Audio preprocessing complete: {} bytes of {}", len(result.stdout), PREPROCESS_CODEC)
         
-        processing_time = time.time() - start_time
-        return Path(temp_output_path), processing_time
+        processing_time = time.perf_counter_ns() - start_time
+        return result.stdout, processing_time
     
     except subprocess.CalledProcessError as e:
-        logger.error(f"Error preprocessing audio: {e}")
+        stderr = e.stderr.decode(errors="replace")
+        logger.error(f"Error preprocessing audio: {stderr}")
+        # FFmpeg could not parse the upload at all, so it is the client's data at fault
+        if "Invalid data" in stderr:
+            raise ValueError(f"Unrecognized audio data in {original_filename}. Supported formats: mp3, wav, flac, m4a, ogg, aac, webm")
         raise RuntimeError(f"Audio preprocessing failed: {e}")
+    finally:
+        if memfd is not None:
+            os.close(memfd)
+        if temp_dir is not None:
+            _cleanup_pool.submit(shutil.rmtree, temp_dir, True)
+
+
+def sweep_stale_temp_dirs(max_age_s: float = STALE_TEMP_DIR_AGE_S) -> int:
+    """
+    Remove upload temp dirs left behind by a previous run.
+    
+    Args:
+        max_age_s: Minimum age in seconds for a temp dir to be removed
+    
+    Returns:
+        Number of temp dirs removed
+    """
+    cutoff = time.time() - max_age_s
+    pattern = os.path.join(TEMP_DIR or tempfile.gettempdir(), f"{TEMP_DIR_PREFIX}*")
+    removed = 0
+    for path in glob.glob(pattern):
+        try:
+            if os.path.getmtime(path) < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+        except OSError:
+            # Removed concurrently
+            continue
+    return removed
+
+
+def sniff_format(header: bytes) -> Optional[str]:
+    """
+    Identify the audio container from the first bytes of an upload.
+    
+    Args:
+        header: First bytes of the upload (at least 12)
+    
+    Returns:
+        Format name (wav, flac, ogg, webm, m4a, mp3 or aac), or None if unrecognized
+        (e.g. MP3 with leading junk before the first frame), leaving FFmpeg to probe it
+    """
+    if header[:4] in (b"RIFF", b"RF64", b"BW64") and header[8:12] == b"WAVE":
+        return "wav"
+    if header[:4] == b"fLaC":
+        return "flac"
+    if header[:4] == b"OggS":
+        return "ogg"
+    if header[:4] == b"\x1a\x45\xdf\xa3":
+        return "webm"
+    if header[4:8] in MP4_LEADING_BOXES:
+        return "m4a"
+    if header[:3] == b"ID3":
+        return "mp3"
+    if header[:4] == b"ADIF":
+        return "aac"
+    if len(header) >= 2 and header[0] == 0xFF:
+        # Raw ADTS AAC has a 12-bit frame sync and layer 0; MPEG audio has an 11-bit sync and a non-zero layer
+        if header[1] & 0xF6 == 0xF0:
+            return "aac"
+        if header[1] & 0xE0 == 0xE0 and header[1] & 0x06:
+            return "mp3"
+    return None
+
+
+def _is_16k_mono_flac(header: bytes) -> bool:
+    """
+    Check whether a file header belongs to a FLAC stream with 16KHz mono audio.
+    
+    Args:
+        header: First FLAC_HEADER_SIZE bytes of the upload
+    
+    Returns:
+        True if the STREAMINFO block (always the first metadata block) says 16KHz mono
+    """
+    if len(header) < FLAC_HEADER_SIZE or header[:4] != b"fLaC":
+        return False
+    # STREAMINFO starts at byte 8: sample rate is the 20 bits from byte 18,
+    # followed by 3 bits holding the channel count minus one
+    sample_rate = (header[18] << 12) | (header[19] << 4) | (header[20] >> 4)
+    channels = ((header[20] >> 1) & 0x07) + 1
+    return sample_rate == 16000 and channels == 1
+
+
+# Upload extensions accepted for transcription; a tuple so str.endswith can check them all at once
+ALLOWED_EXTENSIONS = (".mp3", ".wav", ".m4a", ".flac", ".ogg", ".aac", ".webm")
 
 
 def is_valid_audio_format(filename: str) -> bool:
@@ -73,9 +241,7 @@ def is_valid_audio_format(filename: str) -> bool:
     Returns:
         Boolean indicating if the format is valid
     """
-    valid_extensions = ['.mp3', '.wav', '.m4a', '.flac', '.ogg', '.aac', '.webm']
-    _, ext = os.path.splitext(filename.lower())
-    return ext in valid_extensions
+    return filename.lower().endswith(ALLOWED_EXTENSIONS)
 
 
 def get_file_size_mb(file_path: str) -> float:
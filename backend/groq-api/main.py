@@ -1,14 +1,16 @@
 import os
-from typing import Dict, Any
+import asyncio
+from typing import Dict, Any, Optional
 from pathlib import Path
 from dotenv import load_dotenv
-from fastapi import FastAPI, UploadFile, File, HTTPException, Form
+from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from loguru import logger
 import uvicorn
 
 from transcription import TranscriptionService
-from audio_utils import preprocess_audio, is_valid_audio_format
+from audio_utils import sweep_stale_temp_dirs
 
 # Load environment variables
 load_dotenv()
@@ -20,7 +22,8 @@ logger.add("logs/groq_api.log", rotation="10 MB")
 app = FastAPI(
     title="Groq Transcription API",
     description="API for transcribing audio files using the Groq API",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -37,12 +40,30 @@ GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 DEFAULT_MODEL = os.getenv("DEFAULT_MODEL", "distil-whisper-large-v3-en")
 PORT = int(os.getenv("PORT", "8000"))
 HOST = os.getenv("HOST", "0.0.0.0")
+RELOAD = os.getenv("RELOAD", "false").lower() == "true"
+TRANSCRIBE_WORKERS = int(os.getenv("TRANSCRIBE_WORKERS", "8"))
+GROQ_CLIENT_POOL_SIZE = int(os.getenv("GROQ_CLIENT_POOL_SIZE", "4"))
 
-# Initialize transcription service
-transcription_service = TranscriptionService(
-    api_key=GROQ_API_KEY,
-    model=DEFAULT_MODEL
-)
+# Transcription service, created once the server starts
+transcription_service: Optional[TranscriptionService] = None
+# Held so the background warmup task is not garbage collected before it finishes
+_warmup_task: Optional[asyncio.Task] = None
+
+@app.on_event("startup")
+async def load_transcription_service():
+    """Create the transcription service before the server starts accepting requests"""
+    global transcription_service, _warmup_task
+    transcription_service = TranscriptionService(
+        api_key=GROQ_API_KEY,
+        model=DEFAULT_MODEL,
+        client_pool_size=GROQ_CLIENT_POOL_SIZE,
+        preprocess_workers=TRANSCRIBE_WORKERS
+    )
+    removed = await asyncio.to_thread(sweep_stale_temp_dirs)
+    if removed:
+        logger.info("Removed {} stale temp dirs", removed)
+    # Warm the connection in the background so an unreachable API cannot delay startup
+    _warmup_task = asyncio.create_task(transcription_service.warmup())
 
 @app.get("/")
 async def health_check() -> Dict[str, Any]:
@@ -58,8 +79,7 @@ async def transcribe_audio(file: UploadFile = File(...)) -> Dict[str, Any]:
         raise HTTPException(status_code=400, detail="No file uploaded")
     
     try:
-        # Use our transcribe_file_upload method
-        result = transcription_service.transcribe_file_upload(file.file, file.filename)
+        result = await transcription_service.transcribe_file_upload(file.file, file.filename)
         return result
     except ValueError as e:
         # Handle validation errors
@@ -79,4 +99,6 @@ if __name__ == "__main__":
     Path("logs").mkdir(exist_ok=True)
     
     logger.info(f"Starting server on {HOST}:{PORT}")
-    uvicorn.run("main:app", host=HOST, port=PORT, reload=True) 
\ No newline at end of file
+    # Passing the app object avoids importing this module (and its service) a second time;
+    # auto-reload needs the import string and is only enabled on request for development
+    uvicorn.run("main:app" if RELOAD else app, host=HOST, port=PORT, reload=RELOAD) 
\ No newline at end of file
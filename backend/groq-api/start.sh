@@ -7,8 +7,5 @@ else
     source venv/bin/activate
 fi
 
-# Install dependencies if needed
-pip install -r requirements.txt
-
 # Start the FastAPI server
 python main.py 
\ No newline at end of file
@@ -1,29 +1,55 @@
-import os
 import time
-from pathlib import Path
+import asyncio
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, BinaryIO
+import httpx
 from loguru import logger
-from groq import Groq
+from groq import AsyncGroq
 from dotenv import load_dotenv
 
-from audio_utils import preprocess_audio, is_valid_audio_format
+from audio_utils import preprocess_audio, is_valid_audio_format, OUTPUT_FILENAME
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Keep enough idle HTTPS connections open that concurrent uploads reuse them
+# instead of paying a fresh TLS handshake with api.groq.com
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+HTTP_TIMEOUT_S = 60.0
+
 class TranscriptionService:
-    def __init__(self, api_key: str, model: str = "distil-whisper-large-v3-en"):
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "distil-whisper-large-v3-en",
+        client_pool_size: int = 4,
+        preprocess_workers: int = 8
+    ):
         """
         Initialize the transcription service with the Groq API.
         
         Args:
             api_key: Groq API key
             model: Model to use for transcription
+            client_pool_size: Number of Groq clients, each with its own connections, that requests rotate through
+            preprocess_workers: Maximum number of uploads converted by FFmpeg at once
         """
         self.api_key = api_key
         self.model = model
         self._validate_credentials()
-        self.client = Groq(api_key=self.api_key)
+        # Spreading requests over several clients keeps concurrent uploads from
+        # queueing behind one another on the same connection pool
+        self._clients = [
+            AsyncGroq(
+                api_key=self.api_key,
+                http_client=httpx.AsyncClient(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT_S)
+            )
+            for _ in range(max(1, client_pool_size))
+        ]
+        self._next_index = itertools.count()
+        # FFmpeg blocks, so it runs in a bounded pool while the API calls share the event loop
+        self._preprocess_pool = ThreadPoolExecutor(max_workers=preprocess_workers, thread_name_prefix="ffmpeg")
         logger.info(f"TranscriptionService initialized with model: {model}")
         
     def _validate_credentials(self) -> None:
@@ -31,7 +57,20 @@ class TranscriptionService:
         if not self.api_key:
             raise ValueError("Groq API key is required")
     
-    def transcribe_file_upload(self, file: BinaryIO, filename: str) -> Dict[str, Any]:
+    def _next_client(self) -> AsyncGroq:
+        """Pick the next Groq client in round-robin order"""
+        return self._clients[next(self._next_index) % len(self._clients)]
+    
+    async def warmup(self) -> None:
+        """Open the HTTPS connections to Groq so the first requests skip DNS and the TLS handshake"""
+        warmup_start = time.perf_counter()
+        try:
+            await asyncio.gather(*(client.models.list() for client in self._clients))
+            logger.info(f"Groq connection warmed up in {time.perf_counter() - warmup_start:.2f} seconds")
+        except Exception as e:
+            logger.warning(f"Groq connection warmup failed: {e}")
+    
+    async def transcribe_file_upload(self, file: BinaryIO, filename: str) -> Dict[str, Any]:
         """
         Transcribe audio from an uploaded file with detailed performance metrics.
         
@@ -42,67 +81,47 @@ class TranscriptionService:
         Returns:
             Transcription result with performance metrics
         """
-        metrics = {
-            "validation_ms": 0,
-            "preprocessing_ms": 0,
-            "api_call_ms": 0,
-            "total_ms": 0
-        }
-        
-        total_start = time.time()
+        total_start = time.perf_counter_ns()
         
         # Validate file format
-        validation_start = time.time()
         if not is_valid_audio_format(filename):
             logger.error(f"Invalid audio format: {filename}")
             raise ValueError(f"Invalid audio format. Supported formats: mp3, wav, flac, m4a, ogg, aac, webm")
-        metrics["validation_ms"] = round((time.time() - validation_start) * 1000)
         
         try:
             # Preprocess audio
-            preprocessing_start = time.time()
-            logger.info(f"Starting audio preprocessing for {filename}")
-            processed_file_path, processing_time = preprocess_audio(file, filename)
-            metrics["preprocessing_ms"] = round(processing_time * 1000)
+            logger.debug("Starting audio preprocessing for {}", filename)
+            audio_data, processing_time = await asyncio.get_running_loop().run_in_executor(
+                self._preprocess_pool,
+                preprocess_audio,
+                file,
+                filename
+            )
             
             # Execute transcription
-            api_start = time.time()
-            logger.info(f"Starting API call to Groq for transcription")
+            api_start = time.perf_counter_ns()
+            logger.debug("Starting API call to Groq for transcription")
             
-            with open(processed_file_path, "rb") as audio_file:
-                params = {
-                    "model": self.model,
-                    "file": audio_file,
-                    "response_format": "json",
-                    "temperature": 0.0
-                }
-                
-                transcription = self.client.audio.transcriptions.create(**params)
+            params = {
+                "model": self.model,
+                "file": (OUTPUT_FILENAME, audio_data),
+                "response_format": "json",
+                "temperature": 0.0
+            }
             
-            metrics["api_call_ms"] = round((time.time() - api_start) * 1000)
+            transcription = await self._next_client().audio.transcriptions.create(**params)
             
-            # Calculate total time
-            metrics["total_ms"] = round((time.time() - total_start) * 1000)
+            api_end = time.perf_counter_ns()
             
             # Format response
             response = {
                 "text": transcription.text,
                 "language": "en",
-                "total_ms": metrics["total_ms"],
-                "preprocessing_ms": metrics["preprocessing_ms"],
-                "model_inference_ms": metrics["api_call_ms"]
+                "total_ms": (api_end - total_start) // 1_000_000,
+                "preprocessing_ms": processing_time // 1_000_000,
+                "model_inference_ms": (api_end - api_start) // 1_000_000
             }
             
-            # Clean up temporary files
-            try:
-                if os.path.exists(processed_file_path):
-                    os.unlink(processed_file_path)
-                    parent_dir = os.path.dirname(processed_file_path)
-                    if os.path.exists(parent_dir) and not os.listdir(parent_dir):
-                        os.rmdir(parent_dir)
-            except Exception as e:
-                logger.error(f"Error cleaning up temporary files: {e}")
-            
             return response
             
         except Exception as e:
@@ -1,13 +1,22 @@
+import io
 import os
-import tempfile
-import subprocess
-from pathlib import Path
+import asyncio
 from typing import Tuple
+import av
+import numpy as np
 from loguru import logger
 from fastapi import UploadFile
 
+# Sample rate expected by Whisper models
+SAMPLE_RATE = 16000
 
-async def preprocess_audio(file: UploadFile, original_filename: str) -> Tuple[Path, float]:
+
+# Clips quieter than this (RMS and peak, in full scale) are treated as silence
+SILENCE_RMS = 1e-3
+SILENCE_PEAK = 0.01
+
+
+async def preprocess_audio(file: UploadFile, original_filename: str) -> Tuple[np.ndarray, int]:
     """
     Simple and reliable audio preprocessing for transcription.
     
@@ -16,68 +25,73 @@ async def preprocess_audio(file: UploadFile, original_filename: str) -> Tuple[Pa
         original_filename: Original filename with extension
         
     Returns:
-        Path to processed audio file and processing time
+        16 kHz mono float32 samples in [-1, 1] and processing time in nanoseconds
     """
     import time
-    start_time = time.time()
-    
-    # Create a temp directory
-    temp_dir = tempfile.mkdtemp()
-    
-    # Save the uploaded file
-    temp_input_path = os.path.join(temp_dir, original_filename)
-    content = await file.read()
-    with open(temp_input_path, "wb") as f:
-        f.write(content)
-    
-    # Create output path
-    output_filename = f"processed_{os.path.splitext(original_filename)[0]}.wav"
-    output_path = os.path.join(temp_dir, output_filename)
+    start_time = time.perf_counter_ns()
     
-    # Convert using FFmpeg
-    cmd = [
-        "ffmpeg",
-        "-y",  # Overwrite output files
-        "-i", temp_input_path,  # Input file
-        "-ar", "16000",  # Sample rate
-        "-ac", "1",  # Mono
-        "-c:a", "pcm_s16le",  # Output codec
-        output_path  # Output file
-    ]
+    input_data = await file.read()
     
-    # Run FFmpeg directly
+    # Decode and resample in-process with libav, off the event loop
     try:
-        result = subprocess.run(
-            cmd,
-            check=True,
-            capture_output=True,
-            text=True
-        )
-        
-        # Check if output exists
-        if not os.path.exists(output_path):
-            raise RuntimeError("FFmpeg failed to create output file")
+        audio = await asyncio.to_thread(_decode_audio, input_data)
+        if audio.size == 0:
+            raise RuntimeError("Decoding produced no audio samples")
             
-        processing_time = time.time() - start_time
-        return Path(output_path), processing_time
-        
-    except subprocess.CalledProcessError as e:
-        error_msg = f"FFmpeg error: {e.stderr}"
-        if "Invalid data found when processing input" in e.stderr:
-            error_msg = "Audio file appears to be corrupt or invalid format"
+        processing_time = time.perf_counter_ns() - start_time
+        return audio, processing_time
         
-        logger.error(error_msg)
+    except av.error.InvalidDataError as e:
+        error_msg = "Audio file appears to be corrupt or invalid format"
+        logger.error(f"{error_msg}: {e}")
         raise RuntimeError(error_msg)
     except Exception as e:
         logger.error(f"Error preprocessing audio: {str(e)}")
         raise RuntimeError(f"Audio preprocessing failed: {str(e)}")
 
 
+def _decode_audio(data: bytes) -> np.ndarray:
+    """Decode any supported container to 16 kHz mono float32 samples with PyAV."""
+    # Resamplers buffer samples between calls, so each decode gets its own
+    resampler = av.AudioResampler(format="flt", layout="mono", rate=SAMPLE_RATE)
+    chunks = []
+    # A seekable in-memory file lets libav read MP4 indexes stored at the end
+    with av.open(io.BytesIO(data), mode="r", metadata_errors="ignore") as container:
+        for frame in container.decode(audio=0):
+            for resampled in resampler.resample(frame):
+                chunks.append(resampled.to_ndarray().reshape(-1))
+        # Flush samples still buffered in the resampler
+        for resampled in resampler.resample(None):
+            chunks.append(resampled.to_ndarray().reshape(-1))
+    
+    if not chunks:
+        return np.empty(0, dtype=np.float32)
+    return np.concatenate(chunks)
+
+
+def is_silent(audio: np.ndarray) -> bool:
+    """
+    Cheap energy gate for near-silent clips, checked before any model runs.
+    
+    Args:
+        audio: 16 kHz mono float32 samples
+        
+    Returns:
+        True if both the RMS level and the peak are below the silence thresholds
+    """
+    if not audio.size:
+        return True
+    rms = np.sqrt(np.dot(audio, audio) / audio.size)
+    return rms < SILENCE_RMS and np.abs(audio).max() < SILENCE_PEAK
+
+
+# Upload extensions accepted for transcription; a tuple so str.endswith can check them all at once
+ALLOWED_EXTENSIONS = (".mp3", ".wav", ".m4a", ".flac", ".ogg", ".aac", ".webm")
+
+
 def is_valid_audio_format(filename: str) -> bool:
     """Check if file has valid audio extension."""
-    valid_extensions = ['.mp3', '.wav', '.m4a', '.flac', '.ogg', '.aac', '.webm']
-    _, ext = os.path.splitext(filename.lower())
-    return ext in valid_extensions
+    return filename.lower().endswith(ALLOWED_EXTENSIONS)
 
 
 def get_file_size_mb(file_path: str) -> float:
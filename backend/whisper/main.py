@@ -1,8 +1,9 @@
 import os
-from typing import Dict, Any
+from typing import Optional
 from pathlib import Path
 from fastapi import FastAPI, UploadFile, File, HTTPException, Form
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from loguru import logger
 import uvicorn
 
@@ -15,7 +16,8 @@ logger.add("logs/whisper_api.log", rotation="10 MB")
 app = FastAPI(
     title="Whisper API",
     description="API for transcribing audio using Whisper",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -32,9 +34,16 @@ BASE_DIR = Path(__file__).parent.parent.parent
 MODEL_PATH = os.getenv("MODEL_PATH", str(BASE_DIR / "models" / "whisper-base.en"))
 PORT = int(os.getenv("PORT", "8001"))
 HOST = os.getenv("HOST", "0.0.0.0")
+RELOAD = os.getenv("RELOAD", "false").lower() == "true"
 
-# Initialize transcription service
-transcription_service = TranscriptionService(model_path=MODEL_PATH)
+# Transcription service, created once the server starts
+transcription_service: Optional[TranscriptionService] = None
+
+@app.on_event("startup")
+async def load_transcription_service():
+    """Create the transcription service before the server starts accepting requests"""
+    global transcription_service
+    transcription_service = TranscriptionService(model_path=MODEL_PATH)
 
 # Health check endpoint
 @app.get("/")
@@ -50,14 +59,14 @@ async def transcribe_audio(
 ):
     """Transcribe an audio file and return the transcription."""
     filename = file.filename
-    logger.info(f"Received transcription request for: {filename}")
+    logger.info("Received transcription request for: {}", filename)
     
     try:
         if not filename:
             raise ValueError("No filename provided")
         
         result = await transcription_service.transcribe_file_upload(file, filename)
-        logger.info(f"Transcription completed in {result.get('total_ms', 0)}ms")
+        logger.info("Transcription completed in {}ms", result.get("total_ms", 0))
         
         return result
     except ValueError as e:
@@ -77,4 +86,6 @@ if __name__ == "__main__":
     Path("logs").mkdir(exist_ok=True)
     
     logger.info(f"Starting server on {HOST}:{PORT}")
-    uvicorn.run("main:app", host=HOST, port=PORT, reload=True) 
\ No newline at end of file
+    # Passing the app object avoids importing this module (and its service) a second time;
+    # auto-reload needs the import string and is only enabled on request for development
+    uvicorn.run("main:app" if RELOAD else app, host=HOST, port=PORT, reload=RELOAD) 
\ No newline at end of file